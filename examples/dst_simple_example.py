@@ -8,6 +8,12 @@ import matplotlib.pyplot as plt
 import pyOxygenSCPI
 import pyOxygenStream
 
+def _grow(buf, min_rows):
+    """ Return a copy of buf with at least min_rows rows, doubling its size """
+    new_buf = np.empty((max(min_rows, 2 * len(buf)), buf.shape[1]), dtype=buf.dtype)
+    new_buf[:len(buf)] = buf
+    return new_buf
+
 #%%
 # Measurement Device IP Settings
 ip_addr = '127.0.0.1'
@@ -33,16 +39,22 @@ if not dt_stream.connectTo(ip_addr, stream_port):
     sys.exit()
 print(f"Connected via DST to {ip_addr:s}:{stream_port:d}")
 
+# Set Time to Stream here in Seconds
+time_to_stream = 10
+# Expected sample rate, only used to size the data buffers (they grow if needed)
+est_sample_rate = 10000
+
 # Create Data Container and start stream
+# Each channel gets a preallocated buffer and a fill offset
 data = {}
+data_offset = {}
 for chName in measurementDevice.DataStream.ChannelList:
-    data[chName] = []
+    data[chName] = None
+    data_offset[chName] = 0
 measurementDevice.DataStream.start()
 print("Stream Started!")
 
 start_time = time.time()
-# Set Time to Stream here in Seconds
-time_to_stream = 10
 
 last_logged_time = start_time
 pkg_count = 0
@@ -62,8 +74,19 @@ while time.time() < (start_time + time_to_stream):
         # Iterate over each Channel in the channel list
         for idx, chName in enumerate(measurementDevice.DataStream.ChannelList):
             # Only append data, if available for the specific channel
-            if data_pkg[idx].size > 0:
-                data[chName].append(data_pkg[idx])
+            pkt = data_pkg[idx]
+            if pkt.size > 0:
+                buf = data[chName]
+                off = data_offset[chName]
+                n = pkt.shape[0]
+                if buf is None:
+                    buf = np.empty((max(n, est_sample_rate * time_to_stream * 2), pkt.shape[1]),
+                                   dtype=pkt.dtype)
+                elif off + n > len(buf):
+                    buf = _grow(buf, off + n)
+                buf[off:off+n] = pkt
+                data[chName] = buf
+                data_offset[chName] = off + n
             # Do additional things here for live processing of received data
     
     # Log Number of received packages every second
@@ -84,11 +107,14 @@ print("Stream Stopped")
 dt_stream.disconnect()
 print("Disconnected from DST")
 
-# Concat Data
+# Trim Data to the received samples
 print("Following Channels Received with Shape:")
 for chName, val in data.items():
-    print(chName, ":", np.concatenate(val).shape)
-    data[chName] = np.concatenate(val)
+    if val is None:
+        # No samples received, shape unknown (like an empty channel in readPacket)
+        val = np.empty(0)
+    data[chName] = val[:data_offset[chName]]
+    print(chName, ":", data[chName].shape)
 
 # Disconnect SCPI Connection
 measurementDevice.disconnect()
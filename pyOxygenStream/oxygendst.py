@@ -12,6 +12,13 @@ import numpy as np
 import xml.etree.ElementTree as ET
 import logging
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
 # General data stream definitions
 DT_PROTOCOL_VERSION = 0x01050000
 DT_WELCOME_MSG_SIZE = 64
@@ -27,6 +34,7 @@ DT_SYNC_FIXED_FMT = "=3IQd"
 DT_SYNC_FIXED_SIZE = 28
 DT_ASYNC_FIXED_FMT = "=3Id"
 DT_ASYNC_FIXED_SIZE = 20
+DT_RX_BUFFER_SIZE = 64 * 1024
 
 # Sub packet types
 SBT_PACKET_INFO = 0x00000001
@@ -62,14 +70,122 @@ DT_DATA_TYPE = {
     15: False
 }
 
-def recvFixedSize(s, size):
-    data = bytearray(size)
-    view = memoryview(data)
-    data_to_read = size
-    while data_to_read:
-        num_bytes = s.recv_into(view, data_to_read)
-        view = view[num_bytes:]
-        data_to_read -= num_bytes
+# Prebuilt numpy dtypes for all natively supported data types
+DT_NP_DTYPE = {
+    0:  np.dtype("int8"),
+    1:  np.dtype("uint8"),
+    2:  np.dtype("int16"),
+    3:  np.dtype("uint16"),
+    6:  np.dtype("int32"),
+    7:  np.dtype("uint32"),
+    8:  np.dtype("int64"),
+    9:  np.dtype("uint64"),
+    10: np.dtype("float32"),
+    11: np.dtype("float64"),
+    12: np.dtype("complex64"),
+    13: np.dtype("complex128")
+}
+
+if njit is not None:
+    @njit(cache=True)
+    def decodeInt24(raw, factor, offset, signed, out):
+        """ Decode little endian 24 bit samples and scale them into out
+        in a single pass (only available if numba is installed)
+        """
+        for i in range(out.size):
+            value = (np.int64(raw[3*i]) | (np.int64(raw[3*i+1]) << 8) |
+                     (np.int64(raw[3*i+2]) << 16))
+            if signed and value & 0x800000:
+                value -= 0x1000000
+            out[i] = value * factor + offset
+else:
+    decodeInt24 = None
+
+def channelSampleType(sub_packet):
+    """ Return the sample type of a channel sub packet or False if its
+    samples cannot be read. 24 bit types have no numpy equivalent and are
+    returned by name.
+    """
+    type_id = sub_packet.channel_data_type
+    sample_type = DT_NP_DTYPE.get(type_id) or DT_DATA_TYPE.get(type_id, False)
+    if not sample_type:
+        logger.warning("Data type not supported yet by python")
+        return False
+    if sub_packet.number_samples == 0:
+        logger.warning("No or invalid data received.")
+        return False
+    return sample_type
+
+def decodeSamples(packet, pos, num_samples, sample_type, factor, offset, out=None):
+    """ Decode num_samples scalar samples starting at pos and scale them
+    into out (float64)
+    """
+    if (sample_type == 'int24' or sample_type == 'uint24') and decodeInt24 is not None:
+        raw = np.frombuffer(packet, dtype="uint8", offset=pos, count=num_samples*3)
+        if out is None:
+            out = np.empty(num_samples, dtype="float64")
+        decodeInt24(raw, float(factor), float(offset), sample_type == 'int24', out)
+        return out
+
+    if sample_type == 'int24' or sample_type == 'uint24':
+        # Pad each 3 byte sample with a 4th (sign) byte and reinterpret
+        # the (N,4) block as little endian 32 bit integers
+        raw = np.frombuffer(packet, dtype="uint8", offset=pos,
+                            count=num_samples*3).reshape(num_samples, 3)
+        data = np.empty((num_samples, 4), dtype="uint8")
+        data[:, :3] = raw
+        if sample_type == 'int24':
+            data[:, 3] = np.where(raw[:, 2] & 0x80, 0xFF, 0x00)
+            data = data.view('<i4').ravel()
+        else:
+            data[:, 3] = 0
+            data = data.view('<u4').ravel()
+
+    else:
+        data = np.frombuffer(packet, dtype=sample_type, offset=pos, count=num_samples)
+
+    if out is None:
+        out = np.empty(num_samples, dtype="float64")
+    # Scale in place to avoid float64 temporaries
+    np.multiply(data, factor, out=out, dtype="float64", casting="unsafe")
+    np.add(out, offset, out=out)
+    return out
+
+def decodeSync(packet, pos, sample_type, dim, num_samples, timestamp,
+               timebase_frequency, factor, offset):
+    """ Decode a sync fixed sub packet into rows [t, x] or [t, x_0 .. x_dim-1]
+
+    Scalar samples are scaled, array samples are returned as is.
+    """
+    if dim == 1:
+        dtype = "float64"
+    else:
+        # Keep complex array samples complex
+        dtype = np.result_type(sample_type, "float64")
+    data = np.empty((num_samples, 1 + dim), dtype=dtype)
+    np.divide(np.arange(timestamp, timestamp+num_samples), timebase_frequency, out=data[:, 0])
+    if dim == 1:
+        decodeSamples(packet, pos+DT_SYNC_FIXED_SIZE, num_samples, sample_type,
+                      factor, offset, data[:, 1])
+    else:
+        data[:, 1:] = np.frombuffer(packet, dtype=sample_type, offset=pos+DT_SYNC_FIXED_SIZE,
+                                    count=num_samples*dim).reshape(num_samples, dim)
+    return data
+
+def asyncRecords(packet, pos, sample_type, num_samples, shape=()):
+    """ Return the (timestamp f0, samples f1) records of an async fixed sub
+    packet as a structured view; shape is the per record sample shape
+    """
+    return np.frombuffer(packet, dtype=[("f0", "uint64"), ("f1", sample_type, shape)],
+                         offset=pos+DT_ASYNC_FIXED_SIZE, count=num_samples)
+
+def decodeAsync(packet, pos, sample_type, dim, num_samples, timebase_frequency):
+    """ Decode an async fixed sub packet into rows [t, x] or [t, x_0 .. x_dim-1]
+    """
+    records = asyncRecords(packet, pos, sample_type, num_samples, (dim,))
+    data = np.empty((num_samples, 1 + dim), dtype=np.result_type(sample_type, "float64"))
+    np.divide(records['f0'], timebase_frequency, out=data[:, 0], casting="unsafe")
+    data[:, 1:] = records['f1']
     return data
 
 def parseargs(argv):
@@ -160,9 +276,26 @@ class OxygenStreamReceiver:
         self.packet_info = DtPacketInfo()
         self.packet_xml = []
         self.scaling_info = []
+        self._last_xml = None
         self.struct_sync_fixed = struct.Struct(DT_SYNC_FIXED_FMT)
         self.struct_async_fixed = struct.Struct(DT_ASYNC_FIXED_FMT)
+        # Bound unpack methods for the hot receive path
+        self._unpack_header = self.struct_header.unpack_from
+        self._unpack_sub = self.struct_subpackage_header.unpack_from
+        self._unpack_info = self.struct_packet_info.unpack_from
+        self._unpack_sync = self.struct_sync_fixed.unpack_from
+        self._unpack_async = self.struct_async_fixed.unpack_from
+        # Sub packet type -> (handler, handler takes the sub packet size)
+        self._sbt_dispatch = {
+            SBT_PACKET_INFO: (self.processPacketInfo, False),
+            SBT_XML_CONFIG: (self.processXmlConfig, True),
+            SBT_SYNC_FIXED: (self.processSyncFixed, False),
+            SBT_ASYNC_FIXED: (self.processAsyncFixed, False)
+        }
         self.actual_channel_idx = 0
+        self._rx = bytearray(DT_RX_BUFFER_SIZE)
+        self._rx_lo = 0
+        self._rx_hi = 0
 
     def connectTo(self, dt_server, port):
         """ Connect to Oxygen on dt_server:port an read welcome message
@@ -172,79 +305,105 @@ class OxygenStreamReceiver:
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self.sock.settimeout(5)
             self.sock.connect((dt_server, port))
+            self._rx_lo = self._rx_hi = 0
         except socket.gaierror as err:
-            logging.error("Invalid address: {}".format(err))
+            logger.error("Invalid address: {}".format(err))
             return False
         except OSError as err:
-            logging.error("Connection to {:s}:{:d} failed: {}".format(dt_server, port, err))
+            logger.error("Connection to {:s}:{:d} failed: {}".format(dt_server, port, err))
             return False
         # Read Welcome Message
         welcome_buffer = bytearray(DT_WELCOME_MSG_SIZE)
         bc = self.sock.recv_into(welcome_buffer, DT_WELCOME_MSG_SIZE)
         if bc == 0:
-            logging.error("Could not read welcome message")
+            logger.error("Could not read welcome message")
             return None
-        logging.debug("Data stream product name: {:s}".format(welcome_buffer.decode()))
+        logger.debug("Data stream product name: {:s}".format(welcome_buffer.decode()))
         return True
 
     def readPacket(self):
         """ Read one packet and process it afterwards
         """
-        # Read packet header
-        packet_header_buffer = bytearray(self.sock.recv(DT_TOKEN_SIZE))
-        packet_size_buffer = bytearray(DT_PACKET_HEADER_SIZE - DT_TOKEN_SIZE)
-        # Search for Packet Start Token
-        while packet_header_buffer != DT_START_TOKEN:
-            logging.error("Invalid start packet token: " + str(packet_header_buffer))
-            try:
-                packet_header_buffer += self.sock.recv(1)
-            except socket.timeout:
-                logging.warning("No data available yet")
-                return False
-            packet_header_buffer.pop(0)
-        # Read Packet Size
         try:
-            bc = self.sock.recv_into(packet_size_buffer, DT_PACKET_HEADER_SIZE - DT_TOKEN_SIZE)
+            # Read packet header (start token and packet size)
+            if not self._fillBuffer(DT_PACKET_HEADER_SIZE):
+                return False
+            token, packet_size = self._unpack_header(self._rx, self._rx_lo)
+            # Search for Packet Start Token, skip headers with an invalid size
+            while token != DT_START_TOKEN or packet_size < DT_PACKET_HEADER_SIZE:
+                if token != DT_START_TOKEN:
+                    logger.error("Invalid start packet token: " + str(token))
+                else:
+                    logger.error("Invalid packet size: {:d}".format(packet_size))
+                idx = self._rx.find(DT_START_TOKEN, self._rx_lo + 1, self._rx_hi)
+                if idx == -1:
+                    # Keep bytes which may be the beginning of a start token
+                    idx = max(self._rx_lo + 1, self._rx_hi - DT_TOKEN_SIZE + 1)
+                self._rx_lo = idx
+                if not self._fillBuffer(DT_PACKET_HEADER_SIZE):
+                    return False
+                token, packet_size = self._unpack_header(self._rx, self._rx_lo)
+            # Read rest of packet
+            if not self._fillBuffer(packet_size):
+                return False
         except socket.timeout:
-            logging.warning("No data available yet")
-            return False
-        if (DT_PACKET_HEADER_SIZE - DT_TOKEN_SIZE) != bc:
-            logging.error("Could not read packet size")
-            return False
-        packet_size = int.from_bytes(packet_size_buffer, byteorder='little', signed=False)
-        # Read rest of packet
-        packet_size -= DT_PACKET_HEADER_SIZE
-        #packet_data = bytearray(packet_size)
-        packet_data = recvFixedSize(self.sock, packet_size)
-        if len(packet_data) != packet_size:
-            logging.error("Could not read all packet data")
+            logger.warning("No data available yet")
             return False
+        packet_data = memoryview(self._rx)[self._rx_lo+DT_PACKET_HEADER_SIZE:self._rx_lo+packet_size]
+        self._rx_lo += packet_size
         self.channelValue = []
         self.processPacket(packet_data)
         return self.channelValue
 
+    def _fillBuffer(self, size):
+        """ Receive until at least size bytes are buffered at _rx_lo
+
+        Reads as much as the socket provides, so following packets are
+        usually already buffered. Returns False if the connection was closed.
+        """
+        while self._rx_hi - self._rx_lo < size:
+            if self._rx_lo + size > len(self._rx):
+                # Move pending bytes to the front, grow if the packet does not fit
+                pending = self._rx_hi - self._rx_lo
+                rx = self._rx
+                if size > len(rx):
+                    rx = bytearray(max(size, 2 * len(rx)))
+                rx[:pending] = self._rx[self._rx_lo:self._rx_hi]
+                self._rx = rx
+                self._rx_lo = 0
+                self._rx_hi = pending
+            num_bytes = self.sock.recv_into(memoryview(self._rx)[self._rx_hi:])
+            if num_bytes == 0:
+                logger.error("Connection closed by peer")
+                return False
+            self._rx_hi += num_bytes
+        return True
+
     def processPacket(self, packet):
         """ Read and unpack packet content according to subpacket types
         """
         pos = 0
         self.actual_channel_idx = 0
         hit_footer = False
-        while pos < len(packet) and not hit_footer:
-            sub_packet_size, sub_packet_type = (
-                self.struct_subpackage_header.unpack_from(packet, pos))
-            if SBT_PACKET_INFO == sub_packet_type:
-                self.processPacketInfo(packet,
-                                       pos+DT_SUBPACKET_HEADER_SIZE)
-            if SBT_XML_CONFIG == sub_packet_type:
-                self.processXmlConfig(packet,
-                                      pos+DT_SUBPACKET_HEADER_SIZE,
-                                      sub_packet_size-DT_SUBPACKET_HEADER_SIZE)
-            if SBT_SYNC_FIXED == sub_packet_type:
-                self.processSyncFixed(packet,
-                                      pos+DT_SUBPACKET_HEADER_SIZE)
-            if SBT_ASYNC_FIXED == sub_packet_type:
-                self.processAsyncFixed(packet, pos+DT_SUBPACKET_HEADER_SIZE)
+        # Bind loop invariants to locals
+        packet_size = len(packet)
+        unpack_sub = self._unpack_sub
+        get_handler = self._sbt_dispatch.get
+        while pos < packet_size and not hit_footer:
+            sub_packet_size, sub_packet_type = unpack_sub(packet, pos)
+            handler = get_handler(sub_packet_type)
+            if handler:
+                process, needs_size = handler
+                if needs_size:
+                    process(packet, pos+DT_SUBPACKET_HEADER_SIZE,
+                            sub_packet_size-DT_SUBPACKET_HEADER_SIZE)
+                else:
+                    process(packet, pos+DT_SUBPACKET_HEADER_SIZE)
+            elif SBT_PACKET_FOOTER == sub_packet_type:
+                hit_footer = True
             pos += sub_packet_size
+        # Drop slots reserved for non-channel sub packets (e.g. xml config)
+        del self.channelValue[self.actual_channel_idx:]
 
     def processPacketInfo(self, packet, pos):
         """ Read packet information
@@ -254,29 +413,38 @@ class OxygenStreamReceiver:
          self.packet_info.sequence_number,
          self.packet_info.stream_status,
          self.packet_info.seed,
-         self.packet_info.number_of_subpackets) = self.struct_packet_info.unpack_from(packet, pos)
-        logging.debug("PacketInfo:")
-        logging.debug("  Version:           {:0x}".format(self.packet_info.protocol_version))
-        logging.debug("  Stream ID:         {:d} ".format(self.packet_info.stream_id))
-        logging.debug("  Seq Number:        {:d} ".format(self.packet_info.sequence_number))
-        logging.debug("  Stream status:     {:0x}".format(self.packet_info.stream_status))
-        logging.debug("  Stream seed:       {:x} ".format(self.packet_info.seed))
-        logging.debug("  Num sub packets:   {:d} ".format(self.packet_info.number_of_subpackets))
+         self.packet_info.number_of_subpackets) = self._unpack_info(packet, pos)
+        # Reserve one slot per sub packet except packet info and footer
+        self.channelValue = [None] * max(0, self.packet_info.number_of_subpackets - 2)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("PacketInfo:")
+            logger.debug("  Version:           {:0x}".format(self.packet_info.protocol_version))
+            logger.debug("  Stream ID:         {:d} ".format(self.packet_info.stream_id))
+            logger.debug("  Seq Number:        {:d} ".format(self.packet_info.sequence_number))
+            logger.debug("  Stream status:     {:0x}".format(self.packet_info.stream_status))
+            logger.debug("  Stream seed:       {:x} ".format(self.packet_info.seed))
+            logger.debug("  Num sub packets:   {:d} ".format(self.packet_info.number_of_subpackets))
 
     def processXmlConfig(self, packet, pos, size):
         """ Read one xml subpackage and add it to the xml list
         """
         sub_packet = DtXmlSubPacket()
-        sub_packet.xml_content = packet[pos:pos+size].decode()
+        sub_packet.xml_content = bytes(packet[pos:pos+size]).decode()
         sub_packet.xml_content_size = size
         self.packet_xml.append(sub_packet)
-        self.parseScalingXML(sub_packet.xml_content)
-        logging.debug("XMLPacket:")
-        logging.debug("  xml_content:     {:s}".format(sub_packet.xml_content))
+        # Oxygen may resend an unchanged config, only parse it once
+        if sub_packet.xml_content != self._last_xml:
+            self._last_xml = sub_packet.xml_content
+            self.parseScalingXML(sub_packet.xml_content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("XMLPacket:")
+            logger.debug("  xml_content:     {:s}".format(sub_packet.xml_content))
 
     def parseScalingXML(self, xml_content):
         root = ET.fromstring(xml_content)
         if root.tag == "ChannelInfo":
+            # A new channel info replaces the previous scaling
+            scaling_info = []
             for child in root:
                 factor = child[0].get('factor')
                 offset = child[0].get('offset')
@@ -287,7 +455,9 @@ class OxygenStreamReceiver:
                 if offset == None:
                     offset = 0
 
-                self.scaling_info.append((factor, offset))
+                scaling_info.append((float(factor), float(offset)))
+
+            self.scaling_info = scaling_info
 
     def processSyncFixed(self, packet, pos):
         """ Read synchronous samples from packet
@@ -297,21 +467,36 @@ class OxygenStreamReceiver:
          sub_packet.channel_dimension,
          sub_packet.number_samples,
          sub_packet.timestamp,
-         sub_packet.timebase_frequency) = self.struct_sync_fixed.unpack_from(packet, pos)
-        data = self.readSamples(packet, sub_packet, pos, SBT_SYNC_FIXED)
-        timeStamps = np.arange(sub_packet.timestamp, sub_packet.timestamp+sub_packet.number_samples)/sub_packet.timebase_frequency
-        data = np.c_[timeStamps, data]
-        self.channelValue.append(data)
-        logging.debug("DtChannelSyncFixed:")
-        logging.debug("  channel idx:         {:d}".format(self.actual_channel_idx))
-        logging.debug("  channel_data_type:   {:d}".format(sub_packet.channel_data_type))
-        logging.debug("  channel_dimension:   {:d}".format(sub_packet.channel_dimension))
-        logging.debug("  number_samples:      {:d}".format(sub_packet.number_samples))
-        logging.debug("  timestamp:           {:d}".format(sub_packet.timestamp))
-        logging.debug("  timebase_frequency:  {:f}".format(sub_packet.timebase_frequency))
-        logging.debug("  first 10 samples:    {:s}".format(np.array2string(data[:10])))
+         sub_packet.timebase_frequency) = self._unpack_sync(packet, pos)
+        sample_type = channelSampleType(sub_packet)
+        if sample_type:
+            factor, offset = self.scaling_info[self.actual_channel_idx]
+            data = decodeSync(packet, pos, sample_type, sub_packet.channel_dimension,
+                              sub_packet.number_samples, sub_packet.timestamp,
+                              sub_packet.timebase_frequency, factor, offset)
+        else:
+            data = np.empty((0, 1 + sub_packet.channel_dimension))
+        self.storeChannelValue(data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DtChannelSyncFixed:")
+            logger.debug("  channel idx:         {:d}".format(self.actual_channel_idx))
+            logger.debug("  channel_data_type:   {:d}".format(sub_packet.channel_data_type))
+            logger.debug("  channel_dimension:   {:d}".format(sub_packet.channel_dimension))
+            logger.debug("  number_samples:      {:d}".format(sub_packet.number_samples))
+            logger.debug("  timestamp:           {:d}".format(sub_packet.timestamp))
+            logger.debug("  timebase_frequency:  {:f}".format(sub_packet.timebase_frequency))
+            logger.debug("  first 10 samples:    {:s}".format(np.array2string(data[:10])))
         self.actual_channel_idx += 1
 
+    def storeChannelValue(self, data):
+        """ Store data in the slot of the actual channel, append if the
+        packet info reserved too few slots (or was missing)
+        """
+        if self.actual_channel_idx < len(self.channelValue):
+            self.channelValue[self.actual_channel_idx] = data
+        else:
+            self.channelValue.append(data)
+
     def processAsyncFixed(self, packet, pos):
         """ Read asynchronous samples from packet
         """
@@ -319,101 +504,63 @@ class OxygenStreamReceiver:
         (sub_packet.channel_data_type,
          sub_packet.channel_dimension,
          sub_packet.number_samples,
-         sub_packet.timebase_frequency) = self.struct_async_fixed.unpack_from(packet, pos)
-        data = self.readSamples(packet, sub_packet, pos, SBT_ASYNC_FIXED)
-        if data.size > 0:
-            timeStamps = data['f0']/sub_packet.timebase_frequency
-            data = np.c_[timeStamps, data['f1']]
-        self.channelValue.append(data)
-        logging.debug("DtChannelAsyncFixed:")
-        logging.debug("  channel idx:         {:d}".format(self.actual_channel_idx))
-        logging.debug("  channel_data_type:   {:d}".format(sub_packet.channel_data_type))
-        logging.debug("  channel_dimension:   {:d}".format(sub_packet.channel_dimension))
-        logging.debug("  number_samples:      {:d}".format(sub_packet.number_samples))
-        logging.debug("  timebase_frequency:  {:f}".format(sub_packet.timebase_frequency))
-        logging.debug("  first 10 samples:    {:s}".format(np.array2string(data[:10])))
+         sub_packet.timebase_frequency) = self._unpack_async(packet, pos)
+        sample_type = channelSampleType(sub_packet)
+        if sample_type:
+            data = decodeAsync(packet, pos, sample_type, sub_packet.channel_dimension,
+                               sub_packet.number_samples, sub_packet.timebase_frequency)
+        else:
+            data = np.empty(0)
+        self.storeChannelValue(data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("DtChannelAsyncFixed:")
+            logger.debug("  channel idx:         {:d}".format(self.actual_channel_idx))
+            logger.debug("  channel_data_type:   {:d}".format(sub_packet.channel_data_type))
+            logger.debug("  channel_dimension:   {:d}".format(sub_packet.channel_dimension))
+            logger.debug("  number_samples:      {:d}".format(sub_packet.number_samples))
+            logger.debug("  timebase_frequency:  {:f}".format(sub_packet.timebase_frequency))
+            logger.debug("  first 10 samples:    {:s}".format(np.array2string(data[:10])))
         self.actual_channel_idx += 1
 
     def readSamples(self, packet, sub_packet, pos, sample_type):
         """ Read data from packet
         """
-        dtype = DT_DATA_TYPE[sub_packet.channel_data_type]
+        dtype = channelSampleType(sub_packet)
         dim = sub_packet.channel_dimension
         num_samples = sub_packet.number_samples
-        if dtype:
-            if sample_type == SBT_SYNC_FIXED and num_samples > 0:
-                if dim == 1:
-                    data = self.readSamplesSync(packet, pos, num_samples, dtype)
-                else:
-                    data = self.readArraySync(packet, pos, dim, num_samples, dtype)
-
-            elif sample_type == SBT_ASYNC_FIXED and sub_packet.number_samples > 0:
-                if dim == 1:
-                    data = self.readSamplesAsync(packet, pos, num_samples, dtype)
-                else:
-                    data = self.readArrayAsync(packet, pos, dim, num_samples, dtype)
-            else:
-                logging.warning("No or invalid data received.")
-                data = np.empty(0)
-
-        elif not dtype:
-            logging.warning("Data type not supported yet by python")
+        if not dtype:
             data = np.empty(0)
+        elif sample_type == SBT_SYNC_FIXED:
+            if dim == 1:
+                data = self.readSamplesSync(packet, pos, num_samples, dtype)
+            else:
+                data = self.readArraySync(packet, pos, dim, num_samples, dtype)
         else:
-            data = np.empty(0)
+            if dim == 1:
+                data = self.readSamplesAsync(packet, pos, num_samples, dtype)
+            else:
+                data = self.readArrayAsync(packet, pos, dim, num_samples, dtype)
 
         return data
 
-    def readSamplesSync(self, packet, pos: int, num_samples: int, sample_type: str):
-
-        f = float(self.scaling_info[self.actual_channel_idx][0])
-        o = float(self.scaling_info[self.actual_channel_idx][1])
-
-        if sample_type == 'int24':
-            data = np.frombuffer(packet, dtype="uint8",  offset=pos+DT_SYNC_FIXED_SIZE, count=num_samples*3)
-            data = data[2::3].astype('int8').astype('int32')*2**16+data[1::3].astype('int32')*2**8+data[::3]
-
-        elif sample_type == 'uint24':
-            data = np.frombuffer(packet, dtype="uint8",  offset=pos+DT_SYNC_FIXED_SIZE, count=num_samples*3)
-            data = data[2::3].astype('int32')*2**16+data[1::3].astype('int32')*2**8+data[::3]
-
-        else:
-            data = np.frombuffer(packet, dtype=sample_type, offset=pos+DT_SYNC_FIXED_SIZE, count=num_samples)
+    def readSamplesSync(self, packet, pos: int, num_samples: int, sample_type: str, out=None):
 
-        return data.astype('float64') * f + o
+        f, o = self.scaling_info[self.actual_channel_idx]
+        return decodeSamples(packet, pos+DT_SYNC_FIXED_SIZE, num_samples, sample_type, f, o, out)
 
     def readArraySync(self, packet, pos: int, dim: int, num_samples: int, sample_type: str):
 
-        data = []
-        cur = pos + DT_SYNC_FIXED_SIZE
-
-        for i in range(0, num_samples):
-            data.append(np.frombuffer(packet, dtype=sample_type, offset=cur, count=dim))
-            cur += dim * np.dtype(sample_type).itemsize
+        data = np.frombuffer(packet, dtype=sample_type, offset=pos+DT_SYNC_FIXED_SIZE,
+                             count=num_samples*dim).reshape(num_samples, dim)
 
         return data
 
 
     def readSamplesAsync(self, packet, pos, num_samples, sample_type):
-        data = np.frombuffer(packet, dtype="uint64,"+sample_type,
-                             offset=pos+DT_ASYNC_FIXED_SIZE, count=num_samples)
-
-        return data
+        return asyncRecords(packet, pos, sample_type, num_samples)
 
     def readArrayAsync(self, packet, pos, dim, num_samples, sample_type):
-
-        data = []
-        cur = pos + DT_ASYNC_FIXED_SIZE
-
-        for i in range(0, num_samples):
-            ts = np.frombuffer(packet, dtype="uint64", offset=cur, count=1)[0]
-            cur += np.dtype('uint64').itemsize
-            samples = list(np.frombuffer(packet, dtype=sample_type, offset=cur, count=dim))
-            samples.insert(0, ts)
-            data.append(samples)
-            cur += dim * np.dtype(sample_type).itemsize
-
-        return data
+        return asyncRecords(packet, pos, sample_type, num_samples, (dim,))
 
     def disconnect(self):
         """ Disconnect from Oxygen stream socket
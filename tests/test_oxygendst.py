@@ -3,11 +3,23 @@ Copyright DEWETRON GmbH 2024
 
 pyOxygenStream library - Unit Tests
 """
-from pyOxygenStream import OxygenStreamReceiver
+import socket
+import struct
+import numpy as np
+import pytest
+from pyOxygenStream import OxygenStreamReceiver, oxygendst
+from pyOxygenStream.oxygendst import (DtChannelAsyncFixed, DtChannelSyncFixed,
+                                      SBT_ASYNC_FIXED, SBT_SYNC_FIXED, decodeAsync, decodeSync)
 
 DT_SYNC_FIXED_SIZE = 28
+DT_ASYNC_FIXED_SIZE = 20
 
-def test_readSamplesSync():
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_readSamplesSync(monkeypatch, use_numba):
+    if not use_numba:
+        monkeypatch.setattr(oxygendst, "decodeInt24", None)
+    elif oxygendst.decodeInt24 is None:
+        pytest.skip("numba not installed")
     stream = OxygenStreamReceiver()
     stream.actual_channel_idx = 0
     stream.scaling_info.append([2, 1])
@@ -23,3 +35,181 @@ def test_readSamplesSync():
     assert out[0] == 1
     assert out[1] == 1 * 2 + 1
     assert out[2] == 0xffffff * 2 + 1
+
+def test_readSamplesSync_float32():
+    stream = OxygenStreamReceiver()
+    stream.actual_channel_idx = 0
+    stream.scaling_info.append((0.001, 0.5))
+
+    packet = b'\x00' * DT_SYNC_FIXED_SIZE + struct.pack('=f', 1234.5678)
+    out = stream.readSamplesSync(packet, 0, 1, np.dtype('float32'))
+    # scaling is done in float64, like astype('float64') * f + o
+    assert out[0] == np.float32(1234.5678).astype('float64') * 0.001 + 0.5
+
+def test_readSamples():
+    stream = OxygenStreamReceiver()
+    stream.actual_channel_idx = 0
+    stream.scaling_info.append((2.0, 1.0))
+
+    sub_packet = DtChannelSyncFixed()
+    sub_packet.channel_data_type = 2
+    sub_packet.channel_dimension = 1
+    sub_packet.number_samples = 2
+    packet = b'\x00' * DT_SYNC_FIXED_SIZE + struct.pack('=2h', 1, -1)
+    out = stream.readSamples(packet, sub_packet, 0, SBT_SYNC_FIXED)
+    assert list(out) == [3, -1]
+
+    sub_packet = DtChannelAsyncFixed()
+    sub_packet.channel_data_type = 10
+    sub_packet.channel_dimension = 1
+    sub_packet.number_samples = 2
+    packet = b'\x00' * DT_ASYNC_FIXED_SIZE + struct.pack('=QfQf', 5, 1.5, 7, 2.5)
+    out = stream.readSamples(packet, sub_packet, 0, SBT_ASYNC_FIXED)
+    assert list(out['f0']) == [5, 7]
+    assert list(out['f1']) == [1.5, 2.5]
+
+    sub_packet.channel_data_type = 14
+    out = stream.readSamples(packet, sub_packet, 0, SBT_ASYNC_FIXED)
+    assert out.size == 0
+
+def test_readArraySync():
+    stream = OxygenStreamReceiver()
+
+    data = b'\x01\x00\x02\x00\x03\x00\x04\x00\x05\x00\x06\x00'
+    packet = b'\x00' * DT_SYNC_FIXED_SIZE + data
+    out = stream.readArraySync(packet, 0, 3, 2, 'int16')
+    assert out.shape == (2, 3)
+    assert list(out[0]) == [1, 2, 3]
+    assert list(out[1]) == [4, 5, 6]
+
+def test_readArrayAsync():
+    stream = OxygenStreamReceiver()
+
+    data = (b'\x0a\x00\x00\x00\x00\x00\x00\x00\x01\x00\x02\x00'
+            b'\x14\x00\x00\x00\x00\x00\x00\x00\x03\x00\x04\x00')
+    packet = b'\x00' * DT_ASYNC_FIXED_SIZE + data
+    out = stream.readArrayAsync(packet, 0, 2, 2, 'uint16')
+    assert list(out['f0']) == [10, 20]
+    assert out['f1'].shape == (2, 2)
+    assert list(out['f1'][1]) == [3, 4]
+
+def test_processSyncFixed():
+    stream = OxygenStreamReceiver()
+    stream.actual_channel_idx = 0
+    stream.channelValue = [None]
+    stream.scaling_info.append((2.0, 1.0))
+
+    # int16, dim 1, 3 samples, timestamp 10, timebase 100 Hz
+    header = struct.pack('=3IQd', 2, 1, 3, 10, 100.0)
+    packet = header + struct.pack('=3h', 0, 1, -1)
+    stream.processSyncFixed(packet, 0)
+    out = stream.channelValue[0]
+    assert out.shape == (3, 2)
+    assert list(out[:, 0]) == [0.1, 0.11, 0.12]
+    assert list(out[:, 1]) == [1, 3, -1]
+
+def _buildPacket(seq, samples):
+    sub_packets = [
+        struct.pack('=2I6I', 32, 1, 0x01050000, 1, seq, 0, 0, 3),
+        struct.pack('=2I3IQd', 36 + 2 * len(samples), 3, 2, 1, len(samples), 0, 10.0),
+        struct.pack('=%dh' % len(samples), *samples),
+        struct.pack('=2I', 8, 7),
+    ]
+    body = b''.join(sub_packets)
+    return b'OXYGEN<<' + struct.pack('=I', len(body) + 12) + body
+
+def test_readPacket():
+    stream = OxygenStreamReceiver()
+    stream.sock.close()
+    stream.sock, server = socket.socketpair()
+    stream.sock.settimeout(1)
+    stream.scaling_info.append((1.0, 0.0))
+
+    server.sendall(_buildPacket(1, [1, 2]) + b'garbage' + _buildPacket(2, [k % 1000 for k in range(40000)]))
+    out = stream.readPacket()
+    assert stream.packet_info.sequence_number == 1
+    assert len(out) == 1
+    assert list(out[0][:, 1]) == [1, 2]
+    out = stream.readPacket()
+    assert stream.packet_info.sequence_number == 2
+    assert out[0].shape == (40000, 2)
+    assert out[0][-1, 1] == 999
+
+    server.close()
+    assert stream.readPacket() is False
+    stream.disconnect()
+
+def test_readPacket_invalidSize():
+    stream = OxygenStreamReceiver()
+    stream.sock.close()
+    stream.sock, server = socket.socketpair()
+    stream.sock.settimeout(1)
+    stream.scaling_info.append((1.0, 0.0))
+
+    bad_header = b'OXYGEN<<' + struct.pack('=I', 0)
+    server.sendall(bad_header + b'OXYGEN<<' + struct.pack('=I', 5) + _buildPacket(3, [7]))
+    out = stream.readPacket()
+    assert stream.packet_info.sequence_number == 3
+    assert list(out[0][:, 1]) == [7]
+
+    server.close()
+    stream.disconnect()
+
+def test_processPacket_undersizedCount():
+    stream = OxygenStreamReceiver()
+    stream.scaling_info.append((1.0, 0.0))
+    stream.scaling_info.append((1.0, 0.0))
+
+    # Packet info announces only 2 sub packets, followed by two channels
+    sync = struct.pack('=2I3IQd', 38, 3, 2, 1, 1, 0, 10.0) + struct.pack('=h', 4)
+    packet = (struct.pack('=2I6I', 32, 1, 0x01050000, 1, 1, 0, 0, 2) +
+              sync + sync + struct.pack('=2I', 8, 7))
+    stream.channelValue = []
+    stream.processPacket(packet)
+    assert len(stream.channelValue) == 2
+    assert stream.channelValue[1][0, 1] == 4
+
+    # No packet info at all
+    stream.channelValue = []
+    stream.processPacket(sync + struct.pack('=2I', 8, 7))
+    assert len(stream.channelValue) == 1
+
+def test_processXmlConfig():
+    stream = OxygenStreamReceiver()
+
+    xml = b'<ChannelInfo><Channel><Scaling factor="2" offset="1"/></Channel></ChannelInfo>'
+    stream.processXmlConfig(xml, 0, len(xml))
+    stream.processXmlConfig(xml, 0, len(xml))
+    assert stream.scaling_info == [(2.0, 1.0)]
+    assert len(stream.packet_xml) == 2
+
+def test_decodeSync_complexArray():
+    # complex64, dim 2, 1 sample, timebase 1 Hz
+    header = struct.pack('=3IQd', 12, 2, 1, 0, 1.0)
+    packet = header + np.array([1+2j, 3+4j], dtype='complex64').tobytes()
+    out = decodeSync(packet, 0, np.dtype('complex64'), 2, 1, 0, 1.0, 1.0, 0.0)
+    assert out.dtype == np.complex128
+    assert list(out[0]) == [0, 1+2j, 3+4j]
+
+def test_decodeAsync():
+    # float32, dim 2, 2 samples, timebase 10 Hz
+    header = struct.pack('=3Id', 10, 2, 2, 10.0)
+    packet = header + struct.pack('=Q2f', 5, 1.5, 2.5) + struct.pack('=Q2f', 15, 3.5, 4.5)
+    out = decodeAsync(packet, 0, np.dtype('float32'), 2, 2, 10.0)
+    assert out.shape == (2, 3)
+    assert list(out[0]) == [0.5, 1.5, 2.5]
+    assert list(out[1]) == [1.5, 3.5, 4.5]
+
+def test_processXmlConfig_changed():
+    stream = OxygenStreamReceiver()
+    stream.actual_channel_idx = 0
+
+    xml_a = b'<ChannelInfo><Channel><Scaling factor="2" offset="1"/></Channel></ChannelInfo>'
+    xml_b = b'<ChannelInfo><Channel><Scaling factor="5"/></Channel></ChannelInfo>'
+    stream.processXmlConfig(xml_a, 0, len(xml_a))
+    stream.processXmlConfig(xml_b, 0, len(xml_b))
+    assert stream.scaling_info == [(5.0, 0.0)]
+
+    packet = b'\x00' * DT_SYNC_FIXED_SIZE + struct.pack('=h', 3)
+    out = stream.readSamplesSync(packet, 0, 1, np.dtype('int16'))
+    assert out[0] == 15